@@ -51,8 +51,14 @@ export async function classifyImage(uri: string): Promise<ClassifyResult> {
     });
     const bytes = base64ToUint8Array(base64);
     // useTArray=true returns a faster Uint8Array; tolerantDecoding=true
-    // accepts slightly malformed JPEGs from various cameras.
-    const decoded = decodeJpeg(bytes, { useTArray: true, tolerantDecoding: true });
+    // accepts slightly malformed JPEGs from various cameras;
+    // formatAsRGBA=false skips filling an alpha byte per pixel we never
+    // read, so the output buffer is a quarter smaller.
+    const decoded = decodeJpeg(bytes, {
+      useTArray: true,
+      tolerantDecoding: true,
+      formatAsRGBA: false,
+    });
     const hue = extractDominantHue(decoded);
     const stage = hueToStage(hue);
     const confidence = calculateStageConfidence(hue, stage);
@@ -91,33 +97,38 @@ function extractDominantHue(img: DecodedImage): number {
     : 1;
   const step = SAMPLE_RATE * downsample;
 
-  // jpeg-js returns RGBA — 4 bytes per pixel. Collect the hue of every
-  // saturated banana-candidate pixel; the median is taken below.
-  const hues: number[] = [];
+  // Collect the hue of every saturated banana-candidate pixel into a typed
+  // buffer sized for the sampling grid; the median is taken below.
+  const hues = new Float64Array(Math.ceil(height / step) * Math.ceil(width / step));
+  let count = 0;
 
   for (let y = 0; y < height; y += step) {
     for (let x = 0; x < width; x += step) {
-      const i = (y * width + x) * 4;
+      // jpeg-js packs RGB (3 bytes per pixel) when formatAsRGBA is false.
+      const i = (y * width + x) * 3;
       const r = data[i] / 255;
       const g = data[i + 1] / 255;
       const b = data[i + 2] / 255;
 
       // Skip nearly-grayscale pixels (very low saturation) — they don't
       // tell us anything about ripeness and dominate the count when a
-      // banana is photographed against a white wall.
-      if (isLowSaturation(r, g, b)) continue;
+      // banana is photographed against a white wall. max/min are shared
+      // with the hue math, and rejected pixels never reach it.
+      const max = Math.max(r, g, b);
+      const min = Math.min(r, g, b);
+      if (isLowSaturation(max, min)) continue;
 
-      const hue = rgbToHue(r, g, b);
+      const hue = rgbToHue(r, g, b, max, max - min);
       // Drop hues no banana ever shows — cyan through magenta. This removes the
       // blue half of a fruit sticker and blue/purple backgrounds, while keeping
       // the whole banana range (deep-brown reds ~0–40°, yellows, greens to ~150°).
       if (hue >= 160 && hue <= 340) continue;
 
-      hues.push(hue);
+      hues[count++] = hue;
     }
   }
 
-  if (hues.length === 0) {
+  if (count === 0) {
     return 60; // Default green, matches the Python fallback.
   }
 
@@ -125,24 +136,25 @@ function extractDominantHue(img: DecodedImage): number {
   // minority of the frame, so it can't move the median the way it could win
   // the old histogram mode. Rounded to 5° to match the granularity the stage
   // boundaries in lib/stages.ts were calibrated against.
-  hues.sort((a, b) => a - b);
-  const mid = hues.length >> 1;
-  const median = hues.length % 2 === 0
-    ? (hues[mid - 1] + hues[mid]) / 2
-    : hues[mid];
+  // Typed-array sort is numeric and native, no comparator callback per swap.
+  const sorted = hues.subarray(0, count).sort();
+  const mid = count >> 1;
+  const median = count % 2 === 0
+    ? (sorted[mid - 1] + sorted[mid]) / 2
+    : sorted[mid];
   return Math.round(median / 5) * 5;
 }
 
 /**
- * RGB (0–1) → hue in degrees (0–360). Standard HSV conversion.
+ * RGB (0–1) → hue in degrees (0–360). Standard HSV conversion; the caller
+ * passes in the channel max and the max-min spread it already computed.
  */
-function rgbToHue(r: number, g: number, b: number): number {
-  const max = Math.max(r, g, b);
-  const min = Math.min(r, g, b);
-  const d = max - min;
+function rgbToHue(r: number, g: number, b: number, max: number, d: number): number {
   if (d === 0) return 0;
   let h: number;
-  if (max === r) h = ((g - b) / d) % 6;
+  // With red on top, (g - b) / d already sits in [-1, 1]; the textbook
+  // `% 6` is a no-op here, and negatives wrap below.
+  if (max === r) h = (g - b) / d;
   else if (max === g) h = (b - r) / d + 2;
   else h = (r - g) / d + 4;
   h *= 60;
@@ -154,9 +166,7 @@ function rgbToHue(r: number, g: number, b: number): number {
  * Pixels with very low saturation are gray-ish (background, shadow, white
  * wall). Skip them so the histogram reflects banana color, not the room.
  */
-function isLowSaturation(r: number, g: number, b: number): boolean {
-  const max = Math.max(r, g, b);
-  const min = Math.min(r, g, b);
+function isLowSaturation(max: number, min: number): boolean {
   if (max === 0) return true;
   return (max - min) / max < 0.1;
 }
@@ -175,23 +185,46 @@ function calculateStageConfidence(hue: number, stage: Stage): number {
   return Math.round(Math.max(50, Math.min(100, confidence)) * 10) / 10;
 }
 
+const NON_BASE64 = /[^A-Za-z0-9+/=]/;
+const NON_BASE64_GLOBAL = /[^A-Za-z0-9+/=]/g;
+
+// Char code → 6-bit value, built once instead of on every decode.
+const BASE64_LOOKUP = new Uint8Array(256);
+const BASE64_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/';
+for (let i = 0; i < BASE64_CHARS.length; i++) {
+  BASE64_LOOKUP[BASE64_CHARS.charCodeAt(i)] = i;
+}
+
 /**
  * Decode base64 string → Uint8Array. We avoid the global atob call
  * because it's not consistently available across React Native/Hermes
  * versions; this loop is small and reliable.
  */
 function base64ToUint8Array(b64: string): Uint8Array {
-  const cleaned = b64.replace(/[^A-Za-z0-9+/=]/g, '');
-  const lookup = new Uint8Array(256);
-  const chars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/';
-  for (let i = 0; i < chars.length; i++) lookup[chars.charCodeAt(i)] = i;
-
+  // The payload is several MB for a camera shot. FileSystem hands back clean
+  // base64, so only pay for the stripping copy when stray characters
+  // (line breaks, whitespace) are actually present.
+  const cleaned = NON_BASE64.test(b64) ? b64.replace(NON_BASE64_GLOBAL, '') : b64;
+  const lookup = BASE64_LOOKUP;
   const len = cleaned.length;
   const padding = cleaned.endsWith('==') ? 2 : cleaned.endsWith('=') ? 1 : 0;
   const out = new Uint8Array(((len * 3) >> 2) - padding);
 
+  let i = 0;
   let outIndex = 0;
-  for (let i = 0; i < len; i += 4) {
+  // Every group that decodes to a full 3 bytes skips the bounds checks.
+  // Only the final, possibly padded, group needs them.
+  const fullGroupsEnd = Math.floor(out.length / 3) * 4;
+  for (; i < fullGroupsEnd; i += 4) {
+    const a = lookup[cleaned.charCodeAt(i)];
+    const b = lookup[cleaned.charCodeAt(i + 1)];
+    const c = lookup[cleaned.charCodeAt(i + 2)];
+    const d = lookup[cleaned.charCodeAt(i + 3)];
+    out[outIndex++] = (a << 2) | (b >> 4);
+    out[outIndex++] = ((b & 15) << 4) | (c >> 2);
+    out[outIndex++] = ((c & 3) << 6) | d;
+  }
+  for (; i < len; i += 4) {
     const a = lookup[cleaned.charCodeAt(i)];
     const b = lookup[cleaned.charCodeAt(i + 1)];
     const c = lookup[cleaned.charCodeAt(i + 2)];
@@ -118,9 +118,19 @@ export const STAGES: Record<Stage, StageDef> = {
   },
 };
 
+// Stage bands sorted by their lower hue edge, built once from STAGES so the
+// classifier and the stage table can't drift apart. Bands are half-open
+// [min, max) and contiguous from 0°, except the top band (Stage 1), whose
+// upper edge is inclusive.
+const HUE_BANDS = Object.values(STAGES).sort((a, b) => a.hue[0] - b.hue[0]);
+const HUE_BAND_MINS = HUE_BANDS.map((def) => def.hue[0]);
+const HUE_BAND_STAGES = HUE_BANDS.map((def) => def.stage);
+const HUE_BANDS_MAX = HUE_BANDS[HUE_BANDS.length - 1].hue[1];
+
 /**
  * Map a hue (in degrees, 0–360) to a ripeness stage.
- * Direct port of hue_to_stage() in utils/color_detection.py.
+ * Direct port of hue_to_stage() in utils/color_detection.py, as a binary
+ * search over the band table instead of an if/else ladder.
  */
 export function hueToStage(hue: number): Stage {
   // Boundaries recalibrated 2026-05-22 for real iPhone-camera banana photos.
@@ -130,28 +140,37 @@ export function hueToStage(hue: number): Stage {
   // calibration: a Stage 6/7 banana scanned at hue=40°. Shifting all bounds
   // up by 20° from the Python defaults; further tuning from more data later.
   const h = ((hue % 360) + 360) % 360;
-  if (h >= 80 && h <= 140) return 1;
-  if (h >= 70 && h < 80) return 2;
-  if (h >= 60 && h < 70) return 3;
-  if (h >= 50 && h < 60) return 4;
-  if (h >= 45 && h < 50) return 5;
-  if (h >= 40 && h < 45) return 6;
-  if (h >= 0 && h < 40) return 7;
-  return 6; // Default for any unmapped hue. Was Stage 3 pre-calibration.
+  // Default for any unmapped hue (and NaN). Was Stage 3 pre-calibration.
+  if (!(h <= HUE_BANDS_MAX)) return 6;
+  // Last band whose lower edge is <= h. The first band starts at 0°.
+  let lo = 0;
+  let hi = HUE_BAND_MINS.length - 1;
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >> 1;
+    if (HUE_BAND_MINS[mid] <= h) lo = mid;
+    else hi = mid - 1;
+  }
+  return HUE_BAND_STAGES[lo];
 }
 
-/**
- * Estimate days from current stage until peak (stage 6).
- * Direct port of estimate_days_until_peak() in utils/color_detection.py.
- */
-export function daysUntilPeak(stage: Stage): number {
-  if (stage >= 6) return 0;
+// Days to peak per stage, summed once from the daysToNext midpoints instead
+// of re-walking STAGES on every call (history rows call this per render).
+const DAYS_UNTIL_PEAK = {} as Record<Stage, number>;
+for (let stage = 1; stage <= 7; stage++) {
   let total = 0;
   for (let s = stage; s < 6; s++) {
     const [min, max] = STAGES[s as Stage].daysToNext;
     total += (min + max) / 2;
   }
-  return Math.round(total);
+  DAYS_UNTIL_PEAK[stage as Stage] = Math.round(total);
+}
+
+/**
+ * Estimate days from current stage until peak (stage 6).
+ * Direct port of estimate_days_until_peak() in utils/color_detection.py.
+ */
+export function daysUntilPeak(stage: Stage): number {
+  return DAYS_UNTIL_PEAK[stage];
 }
 
 /**
@@ -165,7 +184,8 @@ export function daysUntilPeak(stage: Stage): number {
 export function peakLabel(stage: Stage): string {
   if (stage === 6) return 'At peak';
   if (stage === 7) return 'Past peak · banana bread';
-  return `Peak in ~${daysUntilPeak(stage)} day${daysUntilPeak(stage) === 1 ? '' : 's'}`;
+  const days = daysUntilPeak(stage);
+  return `Peak in ~${days} day${days === 1 ? '' : 's'}`;
 }
 
 /**